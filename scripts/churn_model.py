@@ -1,35 +1,49 @@
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+import joblib
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 import xgboost as xgb
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
 import shap
 
 class ChurnPredictor:
-    def __init__(self, model_type='xgboost'):
+    def __init__(self, model_type='xgboost', device='cpu'):
         """
         Initialize the ChurnPredictor with specified model type
         
         Parameters:
         -----------
         model_type : str
-            Type of model to use ('logistic', 'random_forest', or 'xgboost')
+            Type of model to use ('logistic', 'random_forest',
+            'hist_gradient_boosting', or 'xgboost')
+        device : str
+            Device for XGBoost training ('cpu' or 'cuda'); ignored by the
+            scikit-learn models
         """
         self.model_type = model_type
         self.model = None
         self.feature_names = None
+        self._explainer = None
         
         if model_type == 'logistic':
             self.model = LogisticRegression(random_state=42)
         elif model_type == 'random_forest':
-            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+            # Trees are independent, so they are grown and queried on all cores
+            self.model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
+        elif model_type == 'hist_gradient_boosting':
+            # Binned (histogram) split finding, parallel over features; a fast
+            # scikit-learn-only alternative to the random forest
+            self.model = HistGradientBoostingClassifier(max_iter=200, early_stopping=True, random_state=42)
         elif model_type == 'xgboost':
-            self.model = xgb.XGBClassifier(random_state=42)
+            # Histogram split finding runs on either device; pass device='cuda'
+            # when a GPU is available
+            self.model = xgb.XGBClassifier(tree_method='hist', device=device, random_state=42)
         else:
-            raise ValueError("model_type must be 'logistic', 'random_forest', or 'xgboost'")
+            raise ValueError("model_type must be 'logistic', 'random_forest', 'hist_gradient_boosting', or 'xgboost'")
     
-    def train(self, X, y, feature_names=None):
+    def train(self, X, y, feature_names=None, categorical_features=None):
         """
         Train the model on the given data
         
@@ -41,9 +55,15 @@ class ChurnPredictor:
             Target variable
         feature_names : list
             List of feature names
+        categorical_features : list of bool, optional
+            Mask of the label-encoded categorical columns of X; the
+            hist_gradient_boosting model splits on those natively
         """
         self.feature_names = feature_names
+        if self.model_type == 'hist_gradient_boosting' and categorical_features is not None:
+            self.model.set_params(categorical_features=categorical_features)
         self.model.fit(X, y)
+        self._explainer = None
     
     def evaluate(self, X, y):
         """
@@ -61,8 +81,10 @@ class ChurnPredictor:
         dict
             Dictionary containing various performance metrics
         """
-        y_pred = self.model.predict(X)
+        # Predict probabilities once; labels follow from the same threshold the
+        # models' own predict() applies (class 1 only when p > 0.5)
         y_pred_proba = self.model.predict_proba(X)[:, 1]
+        y_pred = (y_pred_proba > 0.5).astype(int)
         
         metrics = {
             'accuracy': accuracy_score(y, y_pred),
@@ -74,7 +96,7 @@ class ChurnPredictor:
         
         return metrics
     
-    def get_feature_importance(self, X):
+    def get_feature_importance(self, X, max_samples=None):
         """
         Calculate feature importance using SHAP values
         
@@ -82,14 +104,33 @@ class ChurnPredictor:
         -----------
         X : numpy.ndarray
             Feature matrix
+        max_samples : int, optional
+            Explain a seeded random subsample of at most this many rows
+            (kept in their original order); enough for global importance
+            plots. All rows are explained by default.
             
         Returns:
         --------
         numpy.ndarray
             SHAP values for feature importance
         """
-        explainer = shap.TreeExplainer(self.model) if self.model_type in ['random_forest', 'xgboost'] \
-                   else shap.LinearExplainer(self.model, X)
+        if max_samples is not None and len(X) > max_samples:
+            rows = np.random.default_rng(0).choice(len(X), max_samples, replace=False)
+            X = X[np.sort(rows)]
+        
+        # XGBoost computes exact TreeSHAP contributions in its own C++ (or CUDA)
+        # predictor; the last column is the bias term
+        if self.model_type == 'xgboost':
+            return self.model.get_booster().predict(xgb.DMatrix(X), pred_contribs=True)[:, :-1]
+        
+        # The tree explainer depends only on the fitted model, so it is built once
+        # and reused; the linear explainer uses X as its background data
+        if self.model_type in ['random_forest', 'hist_gradient_boosting']:
+            if self._explainer is None:
+                self._explainer = shap.TreeExplainer(self.model)
+            explainer = self._explainer
+        else:
+            explainer = shap.LinearExplainer(self.model, X)
         shap_values = explainer.shap_values(X)
         
         if isinstance(shap_values, list):
@@ -97,7 +138,48 @@ class ChurnPredictor:
         
         return shap_values
     
-def train_evaluate_model(X, y, feature_names, model_type='xgboost', test_size=0.2):
+    def save(self, path):
+        """
+        Persist the trained predictor so later sessions can load it instead of
+        retraining
+        
+        Parameters:
+        -----------
+        path : str
+            Destination file (e.g. '../models/xgb_model.joblib')
+        """
+        joblib.dump(self, path)
+    
+    @staticmethod
+    def load(path):
+        """
+        Load a predictor saved with save()
+        
+        Parameters:
+        -----------
+        path : str
+            File written by save()
+            
+        Returns:
+        --------
+        ChurnPredictor
+            The trained predictor
+        """
+        return joblib.load(path)
+    
+    def __getstate__(self):
+        # The cached SHAP explainer is rebuilt on demand rather than pickled
+        state = self.__dict__.copy()
+        state['_explainer'] = None
+        return state
+    
+    def __setstate__(self, state):
+        # Predictors pickled before the explainer cache existed lack the attribute
+        state.setdefault('_explainer', None)
+        self.__dict__.update(state)
+    
+def train_evaluate_model(X, y, feature_names, model_type='xgboost', test_size=0.2, device='cpu',
+                         categorical_cols=None):
     """
     Train and evaluate a model with cross-validation
     
@@ -113,6 +195,12 @@ def train_evaluate_model(X, y, feature_names, model_type='xgboost', test_size=0.
         Type of model to use
     test_size : float
         Proportion of dataset to include in the test split
+    device : str
+        Device for XGBoost training ('cpu' or 'cuda')
+    categorical_cols : list of str, optional
+        Names of the label-encoded categorical features (e.g.
+        preprocessing.CATEGORICAL_COLS); the hist_gradient_boosting model
+        splits on those natively
         
     Returns:
     --------
@@ -121,21 +209,30 @@ def train_evaluate_model(X, y, feature_names, model_type='xgboost', test_size=0.
     dict
         Dictionary containing performance metrics
     """
-    # Split the data
+    # Split the data, stratified so the train and test sets keep the same churn
+    # rate as the full data
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=42
+        X, y, test_size=test_size, random_state=42, stratify=y
     )
     
     # Initialize and train the model
-    model = ChurnPredictor(model_type)
-    model.train(X_train, y_train, feature_names)
+    categorical_features = None
+    if categorical_cols is not None:
+        categorical_features = [name in categorical_cols for name in feature_names]
+    model = ChurnPredictor(model_type, device=device)
+    model.train(X_train, y_train, feature_names, categorical_features)
     
     # Get performance metrics
     train_metrics = model.evaluate(X_train, y_train)
     test_metrics = model.evaluate(X_test, y_test)
     
-    # Perform cross-validation
-    cv_scores = cross_val_score(model.model, X, y, cv=5)
+    # Cross-validate on shuffled stratified folds fitted in parallel; each fold's
+    # model runs single-threaded so the folds do not oversubscribe the cores
+    cv_model = clone(model.model)
+    if model_type in ['random_forest', 'xgboost']:
+        cv_model.set_params(n_jobs=1)
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    cv_scores = cross_val_score(cv_model, X, y, cv=cv, n_jobs=-1)
     
     metrics = {
         'train_metrics': train_metrics,
@@ -0,0 +1,56 @@
+import os
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Raw numeric columns; blank Total Charges cells load as text
+NUMERIC_SOURCE_COLS = ['Tenure Months', 'Monthly Charges', 'Total Charges']
+
+def load_data(data_path, columns=None):
+    """
+    Load the raw customer workbook, reusing a Parquet copy of it when that copy
+    is newer than the workbook.
+    
+    Parameters:
+    -----------
+    data_path : str
+        Path to the Excel workbook
+    columns : list of str, optional
+        Workbook columns to return; by default all of them. The Parquet copy
+        always holds the full workbook, so callers reading different column
+        sets share it.
+        
+    Returns:
+    --------
+    pandas.DataFrame
+        Raw customer data with numeric charge and tenure columns
+    """
+    parquet_path = os.path.splitext(data_path)[0] + '.raw.parquet'
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(data_path):
+        try:
+            # Only the requested columns are decoded from the columnar file
+            return pd.read_parquet(parquet_path, columns=columns)
+        except (ImportError, OSError, ValueError):
+            # pyarrow unavailable or an unreadable copy; rebuild it from the workbook
+            pass
+    
+    try:
+        # The Rust-based calamine reader parses .xlsx much faster than openpyxl
+        df = pd.read_excel(data_path, engine='calamine')
+    except (ImportError, ValueError):
+        # python-calamine not installed, or a pandas without the calamine engine
+        df = pd.read_excel(data_path)
+    
+    # Blank Total Charges cells load as ' '; coerce so the column can be stored in Parquet
+    df = df.assign(**{
+        col: pd.to_numeric(df[col], errors='coerce')
+        for col in NUMERIC_SOURCE_COLS
+    })
+    
+    try:
+        df.to_parquet(parquet_path, compression='zstd')
+    except (ImportError, OSError, ValueError):
+        # pyarrow unavailable or data directory read-only; keep reading the workbook
+        logger.warning(f"Could not write Parquet copy to {parquet_path}")
+    return df if columns is None else df[columns]
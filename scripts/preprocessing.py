@@ -7,6 +7,40 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Location columns dropped before modeling
+LOCATION_COLS = ['City', 'State', 'Country', 'Zip Code', 'Lat Long', 'Latitude', 'Longitude']
+
+# Raw numeric columns; blank Total Charges cells load as text
+NUMERIC_SOURCE_COLS = ['Tenure Months', 'Monthly Charges', 'Total Charges']
+
+# Telco column names mapped to the banking context
+COLUMN_MAPPING = {
+    'Monthly Charges': 'MonthlyBankFees',
+    'Total Charges': 'TotalBalance',
+    'Tenure Months': 'YearsWithBank',
+    'Phone Service': 'DebitCard',
+    'Multiple Lines': 'CreditCard',
+    'Internet Service': 'OnlineBanking',
+    'Online Security': 'SecureLogin2FA',
+    'Online Backup': 'AutomaticSavings',
+    'Device Protection': 'FraudProtection',
+    'Tech Support': 'CustomerSupport',
+    'Streaming TV': 'BillPay',
+    'Streaming Movies': 'MobilePayments'
+}
+
+# Categorical columns (after renaming) encoded as integer codes
+CATEGORICAL_COLS = [
+    'Gender', 'Senior Citizen', 'Partner', 'Dependents',
+    'DebitCard', 'CreditCard', 'OnlineBanking', 'SecureLogin2FA',
+    'AutomaticSavings', 'FraudProtection', 'CustomerSupport',
+    'BillPay', 'MobilePayments', 'Contract', 'Paperless Billing',
+    'Payment Method'
+]
+
+# Numeric features standardized after renaming
+NUMERICAL_COLS = ['YearsWithBank', 'MonthlyBankFees', 'TotalBalance']
+
 def preprocess_data(df):
     """
     Preprocess the customer churn data for modeling.
@@ -23,47 +57,28 @@ def preprocess_data(df):
     dict
         Dictionary containing fitted encoders and scalers
     """
-    # Create a copy
-    df_processed = df.copy()
+    # Drop location-specific columns (drop returns a new frame; df is left untouched)
+    df_processed = df.drop(columns=LOCATION_COLS, errors='ignore')
     
-    # Drop location-specific columns
-    location_cols = ['City', 'State', 'Country', 'Zip Code', 'Lat Long', 'Latitude', 'Longitude']
-    df_processed = df_processed.drop(columns=location_cols, errors='ignore')
+    # Coerce numeric source columns read as text (blank Total Charges is ' ') to float64
+    text_cols = [col for col in NUMERIC_SOURCE_COLS if not pd.api.types.is_numeric_dtype(df_processed[col])]
+    if text_cols:
+        df_processed[text_cols] = df_processed[text_cols].apply(pd.to_numeric, errors='coerce').astype('float64')
     
     # Handle Total Charges with improved missing value treatment
     total_charges_null = df_processed['Total Charges'].isnull().sum()
     if total_charges_null > 0:
         logger.info(f"Found {total_charges_null} missing values in Total Charges")
         
-        # Convert to numeric, keeping track of conversion errors
-        df_processed['Total Charges'] = pd.to_numeric(df_processed['Total Charges'], errors='coerce')
-        
         # Calculate imputation value based on tenure and monthly charges
-        df_processed['Total Charges'] = df_processed.apply(
-            lambda row: row['Monthly Charges'] * row['Tenure Months'] 
-            if pd.isnull(row['Total Charges']) 
-            else row['Total Charges'],
-            axis=1
+        df_processed['Total Charges'] = df_processed['Total Charges'].fillna(
+            df_processed['Monthly Charges'] * df_processed['Tenure Months']
         )
         
         logger.info("Imputed missing Total Charges using Monthly Charges * Tenure")
     
     # Rename columns to match banking context
-    column_mapping = {
-        'Monthly Charges': 'MonthlyBankFees',
-        'Total Charges': 'TotalBalance',
-        'Tenure Months': 'YearsWithBank',
-        'Phone Service': 'DebitCard',
-        'Multiple Lines': 'CreditCard',
-        'Internet Service': 'OnlineBanking',
-        'Online Security': 'SecureLogin2FA',
-        'Online Backup': 'AutomaticSavings',
-        'Device Protection': 'FraudProtection',
-        'Tech Support': 'CustomerSupport',
-        'Streaming TV': 'BillPay',
-        'Streaming Movies': 'MobilePayments'
-    }
-    df_processed = df_processed.rename(columns=column_mapping)
+    df_processed = df_processed.rename(columns=COLUMN_MAPPING)
     
     # Convert YearsWithBank from months to years
     df_processed['YearsWithBank'] = df_processed['YearsWithBank'] / 12
@@ -72,22 +87,25 @@ def preprocess_data(df):
     transformers = {}
     
     # Encode categorical variables
-    categorical_cols = df_processed.select_dtypes(include=['object']).columns
-    categorical_cols = [col for col in categorical_cols if col not in ['CustomerID', 'Churn Label', 'Churn Reason']]
+    categorical_cols = [col for col in CATEGORICAL_COLS if col in df_processed.columns]
     
+    # factorize(sort=True) gives LabelEncoder's codes; classes_ come from its categories
+    encoded = {}
     for col in categorical_cols:
+        codes, categories = pd.factorize(df_processed[col], sort=True)
+        encoded[col] = pd.to_numeric(codes, downcast='integer')
         le = LabelEncoder()
-        df_processed[col] = le.fit_transform(df_processed[col])
+        le.classes_ = categories.to_numpy()
         transformers[f'{col}_encoder'] = le
+    df_processed = df_processed.assign(**encoded)
     
-    # Scale numerical features
-    numerical_cols = ['YearsWithBank', 'MonthlyBankFees', 'TotalBalance']
+    # Scale numerical features (fitted in float64, stored as float32)
     scaler = StandardScaler()
-    df_processed[numerical_cols] = scaler.fit_transform(df_processed[numerical_cols])
+    df_processed[NUMERICAL_COLS] = scaler.fit_transform(df_processed[NUMERICAL_COLS]).astype(np.float32)
     transformers['numerical_scaler'] = scaler
     
     # Verify no missing values remain
-    missing_values = df_processed[numerical_cols].isnull().sum()
+    missing_values = df_processed[NUMERICAL_COLS].isnull().sum()
     if missing_values.any():
         logger.warning(f"Remaining missing values after preprocessing: {missing_values}")
     
@@ -123,7 +141,8 @@ def prepare_features(df):
     # Remove any columns that don't exist in the dataframe
     feature_cols = [col for col in feature_cols if col in df.columns]
     
-    X = df[feature_cols].values
+    # float32 halves the matrix and is the precision XGBoost trains in anyway
+    X = df[feature_cols].to_numpy(dtype=np.float32)
     y = df['Churn Value'].values
     
     return X, y, feature_cols
\ No newline at end of file